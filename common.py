@@ -0,0 +1,85 @@
+import os
+from functools import lru_cache
+import pandas as pd
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # PyArrow is optional; fall back to the pandas parser
+    pa = None
+
+# Display figures interactively after saving them (False for batch runs)
+SHOW = False
+
+# Column types of antibacterial_data.csv, shared by every analysis stage
+SCHEMA = {
+    'Plant_Extract': 'category',
+    'Bacteria': 'category',
+    'Activity_Level': 'category',
+    'Concentration_mg_mL': 'int16',
+    'Replicate': 'int16',
+    'Inhibition_Zone_mm': 'float32'
+}
+LABEL_COLUMNS = [col for col, dtype in SCHEMA.items() if dtype == 'category']
+
+# Short plant names (without the Latin binomial) for display, filled by load_data
+SHORT_NAMES = {}
+
+def _read_feather(path):
+    """Memory-map the Arrow IPC copy written by data_generator"""
+    # to_pandas copies every column, so the map can be closed straight away
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(zero_copy_only=False, date_as_object=False)
+
+@lru_cache(maxsize=1)
+def _read_data(path, mtime):
+    """Parse the CSV (or its Feather copy), keeping only the latest (path, modification time)"""
+    # Prefer the Feather copy unless the CSV has been rewritten since
+    feather_path = os.path.splitext(path)[0] + '.feather'
+    if pa is not None and os.path.exists(feather_path) and os.path.getmtime(feather_path) >= mtime:
+        return _read_feather(feather_path)
+    
+    # 'None' is an activity level here, not a missing value
+    if pa is None:
+        return pd.read_csv(path, keep_default_na=False, dtype=SCHEMA, parse_dates=['Test_Date'])
+    
+    labels = pa.dictionary(pa.int32(), pa.string())
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: labels if dtype == 'category' else pa.from_numpy_dtype(np.dtype(dtype))
+                      for col, dtype in SCHEMA.items()},
+        null_values=[]
+    )
+    df = pa_csv.read_csv(path, convert_options=convert_options).to_pandas(date_as_object=False)
+    
+    # Arrow orders dictionary values by first appearance; sort them as pandas would
+    for col in LABEL_COLUMNS:
+        df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    return df
+
+def load_data(path='antibacterial_data.csv', df=None):
+    """Load the antibacterial data (cached until the file changes), or type a DataFrame passed in"""
+    if df is not None:
+        # Match the CSV round trip: labelled categories and narrow numeric columns
+        df = df.astype(SCHEMA)
+    else:
+        try:
+            # Copy, so callers that add columns don't alter the cached frame
+            df = _read_data(path, os.path.getmtime(path)).copy()
+        except FileNotFoundError:
+            print("Data file not found. Please run data_generator.py first.")
+            return None
+    
+    SHORT_NAMES.update({name: name.split('(')[0].strip() for name in df['Plant_Extract'].cat.categories})
+    return df
+
+def save_figure(fig, filename):
+    """Save a figure, then show it (if SHOW) or close it to free its memory"""
+    import matplotlib.pyplot as plt
+    
+    fig.savefig(filename, dpi=300, bbox_inches='tight')
+    if SHOW:
+        plt.show()
+    else:
+        plt.close(fig)
@@ -1,13 +1,62 @@
+import os
 import pandas as pd
 import numpy as np
-import random
-from datetime import datetime, timedelta
 
-def generate_antibacterial_data():
-    """Generate synthetic data for antibacterial activity testing"""
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # PyArrow is optional; fall back to the pandas CSV writer
+    pa = None
+
+def _compute_iz_numpy(plant_idx, bact_idx, conc, base, var, res, noise, out):
+    """Compute inhibition zones (mm) into out using NumPy broadcasting"""
+    out[:] = (base[plant_idx] + np.log10(conc / 10) * 3) * res[bact_idx] + noise * var[plant_idx]
+    np.maximum(out, 0, out=out)
+    return out
+
+# Below this many rows the NumPy version is faster than importing Numba,
+# loading the compiled kernel and starting its thread pool
+NUMBA_MIN_ROWS = 1_000_000
+
+def _compute_iz(plant_idx, bact_idx, conc, base, var, res, noise, out):
+    """Compute inhibition zones (mm) into out, with Numba only for large datasets"""
+    if out.shape[0] >= NUMBA_MIN_ROWS:
+        try:
+            from numba_kernels import compute_iz
+        except ImportError:  # Numba is optional; fall back to plain NumPy
+            pass
+        else:
+            return compute_iz(plant_idx, bact_idx, conc, base, var, res, noise, out)
+    return _compute_iz_numpy(plant_idx, bact_idx, conc, base, var, res, noise, out)
+
+def save_data(df, path='antibacterial_data.csv'):
+    """Write the dataset to CSV, using Arrow's C++ writer when available"""
+    if pa is not None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Store test dates as plain dates, matching the pandas writer
+        date_col = table.schema.get_field_index('Test_Date')
+        table = table.set_column(date_col, 'Test_Date', table['Test_Date'].cast(pa.date32()))
+        pa_csv.write_csv(table, path)
+        
+        # Arrow IPC (Feather) copy that later stages memory-map instead of parsing
+        # the CSV; labels are stored as sorted dictionaries so they load as categories
+        for col in ('Plant_Extract', 'Bacteria', 'Activity_Level'):
+            table = table.set_column(table.schema.get_field_index(col), col, pa.array(pd.Categorical(df[col])))
+        with pa.OSFile(os.path.splitext(path)[0] + '.feather', 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        with open(path, 'w', buffering=1 << 20, newline='') as f:
+            df.reset_index(drop=True).to_csv(f, index=False, float_format='%.2f')
+
+def generate_antibacterial_data(replicates=3):
+    """Generate synthetic data for antibacterial activity testing (replicates per condition)"""
+    
+    # Single seeded generator for all random draws (reproducible output)
+    rng = np.random.default_rng(42)
     
     # Plant extracts with varying effectiveness
-    plant_extracts = [
+    plant_extracts = np.array([
         'Garlic (Allium sativum)',
         'Tea Tree (Melaleuca alternifolia)', 
         'Oregano (Origanum vulgare)',
@@ -18,10 +67,10 @@ def generate_antibacterial_data():
         'Ginger (Zingiber officinale)',
         'Cinnamon (Cinnamomum verum)',
         'Clove (Syzygium aromaticum)'
-    ]
+    ])
     
     # Common bacteria tested
-    bacteria = [
+    bacteria = np.array([
         'Escherichia coli',
         'Staphylococcus aureus',
         'Streptococcus pyogenes',
@@ -30,14 +79,11 @@ def generate_antibacterial_data():
         'Salmonella typhimurium',
         'Enterococcus faecalis',
         'Klebsiella pneumoniae'
-    ]
+    ])
     
     # Concentration levels (mg/mL)
     concentrations = [10, 25, 50, 100, 200]
     
-    # Generate data
-    data = []
-    
     # Define effectiveness profiles for different plants
     plant_effectiveness = {
         'Garlic (Allium sativum)': {'base': 15, 'variance': 5},
@@ -64,54 +110,55 @@ def generate_antibacterial_data():
         'Klebsiella pneumoniae': 0.8
     }
     
-    for plant in plant_extracts:
-        for bacterium in bacteria:
-            for concentration in concentrations:
-                for replicate in range(3):  # 3 replicates per condition
-                    
-                    # Calculate zone of inhibition (mm)
-                    base_effectiveness = plant_effectiveness[plant]['base']
-                    variance = plant_effectiveness[plant]['variance']
-                    resistance_factor = bacterial_resistance[bacterium]
-                    
-                    # Concentration effect (logarithmic relationship)
-                    conc_effect = np.log10(concentration / 10) * 3
-                    
-                    # Calculate inhibition zone
-                    inhibition_zone = (base_effectiveness + conc_effect) * resistance_factor
-                    inhibition_zone += np.random.normal(0, variance)
-                    
-                    # Ensure minimum of 0
-                    inhibition_zone = max(0, inhibition_zone)
-                    
-                    # Determine activity level
-                    if inhibition_zone >= 20:
-                        activity_level = 'High'
-                    elif inhibition_zone >= 15:
-                        activity_level = 'Moderate'
-                    elif inhibition_zone >= 10:
-                        activity_level = 'Low'
-                    else:
-                        activity_level = 'None'
-                    
-                    data.append({
-                        'Plant_Extract': plant,
-                        'Bacteria': bacterium,
-                        'Concentration_mg_mL': concentration,
-                        'Replicate': replicate + 1,
-                        'Inhibition_Zone_mm': round(inhibition_zone, 2),
-                        'Activity_Level': activity_level,
-                        'Test_Date': datetime.now() - timedelta(days=random.randint(1, 30))
-                    })
+    # Parallel lookup arrays indexed by plant / bacterium position
+    base_arr = np.array([plant_effectiveness[p]['base'] for p in plant_extracts], dtype=float)
+    var_arr = np.array([plant_effectiveness[p]['variance'] for p in plant_extracts], dtype=float)
+    res_arr = np.array([bacterial_resistance[b] for b in bacteria])
+    
+    # Full factorial design: plant x bacterium x concentration x replicates
+    n_plants, n_bacteria, n_conc, n_rep = len(plant_extracts), len(bacteria), len(concentrations), replicates
+    plant_idx = np.repeat(np.arange(n_plants), n_bacteria * n_conc * n_rep)
+    bact_idx = np.tile(np.repeat(np.arange(n_bacteria), n_conc * n_rep), n_plants)
+    conc_arr = np.tile(np.repeat(concentrations, n_rep), n_plants * n_bacteria)
+    rep_arr = np.tile(np.arange(1, n_rep + 1), n_plants * n_bacteria * n_conc)
+    
+    # Calculate inhibition zone (mm) with a logarithmic concentration effect,
+    # ensuring a minimum of 0
+    noise = rng.standard_normal(len(plant_idx))
+    iz = _compute_iz(plant_idx, bact_idx, conc_arr.astype(float), base_arr, var_arr, res_arr,
+                     noise, np.empty(len(plant_idx)))
+    
+    # Determine activity level
+    activity_labels = np.array(['None', 'Low', 'Moderate', 'High'])
+    activity_level = activity_labels[np.searchsorted(np.array([10, 15, 20]), iz, side='right')]
+    
+    # Test dates spread over the past month
+    test_dates = pd.Timestamp.now().normalize() - pd.to_timedelta(rng.integers(1, 31, len(iz)), unit='D')
+    
+    # Columnar construction: one array per column rather than one dict per row
+    data = {
+        'Plant_Extract': plant_extracts[plant_idx],
+        'Bacteria': bacteria[bact_idx],
+        'Concentration_mg_mL': conc_arr.astype(np.int16),
+        'Replicate': rep_arr.astype(np.int16),
+        'Inhibition_Zone_mm': np.round(iz, 2).astype(np.float32),
+        'Activity_Level': activity_level,
+        'Test_Date': test_dates
+    }
     
     df = pd.DataFrame(data)
-    df.to_csv('antibacterial_data.csv', index=False)
+    save_data(df)
     print(f"Generated {len(df)} data points")
     print(f"Data saved to 'antibacterial_data.csv'")
     return df
 
-if __name__ == "__main__":
+def main():
+    """Generate the dataset and print a preview"""
     df = generate_antibacterial_data()
     print("\nData Preview:")
     print(df.head(10))
     print(f"\nData shape: {df.shape}")
+    return df
+
+if __name__ == "__main__":
+    main()
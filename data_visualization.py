@@ -1,27 +1,20 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
-from matplotlib.patches import Rectangle
+from common import SHORT_NAMES, load_data, save_figure
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('default')
-sns.set_palette("husl")
+def set_plot_style():
+    """Set the shared plot style (matplotlib/seaborn are imported on first use)"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.style.use('default')
+    sns.set_palette("husl")
 
-def load_data():
-    """Load the antibacterial data"""
-    try:
-        df = pd.read_csv('antibacterial_data.csv')
-        return df
-    except FileNotFoundError:
-        print("Data file not found. Please run data_generator.py first.")
-        return None
-
-def create_overview_plots(df):
+def create_overview_plots(df, plant_stats, conc_stats):
     """Create overview visualization plots"""
-    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12), constrained_layout=True)
     fig.suptitle('Antibacterial Activity Overview', fontsize=16, fontweight='bold')
     
     # 1. Distribution of inhibition zones
@@ -39,11 +32,7 @@ def create_overview_plots(df):
     axes[0, 1].set_title('Activity Level Distribution')
     
     # 3. Concentration vs Inhibition Zone
-    concentrations = df['Concentration_mg_mL'].unique()
-    mean_inhibition = [df[df['Concentration_mg_mL'] == c]['Inhibition_Zone_mm'].mean() for c in concentrations]
-    std_inhibition = [df[df['Concentration_mg_mL'] == c]['Inhibition_Zone_mm'].std() for c in concentrations]
-    
-    axes[1, 0].errorbar(concentrations, mean_inhibition, yerr=std_inhibition, 
+    axes[1, 0].errorbar(conc_stats.index, conc_stats['mean'].values, yerr=conc_stats['std'].values, 
                         marker='o', capsize=5, capthick=2, linewidth=2)
     axes[1, 0].set_title('Concentration vs Mean Inhibition Zone')
     axes[1, 0].set_xlabel('Concentration (mg/mL)')
@@ -51,80 +40,90 @@ def create_overview_plots(df):
     axes[1, 0].grid(True, alpha=0.3)
     
     # 4. Top 5 most effective plants
-    plant_means = df.groupby('Plant_Extract')['Inhibition_Zone_mm'].mean().sort_values(ascending=True).tail(5)
+    plant_means = plant_stats['mean'].nlargest(5).sort_values(ascending=True)
     axes[1, 1].barh(range(len(plant_means)), plant_means.values, color='lightgreen')
     axes[1, 1].set_yticks(range(len(plant_means)))
-    axes[1, 1].set_yticklabels([name.split('(')[0].strip() for name in plant_means.index])
+    axes[1, 1].set_yticklabels([SHORT_NAMES[name] for name in plant_means.index])
     axes[1, 1].set_title('Top 5 Most Effective Plant Extracts')
     axes[1, 1].set_xlabel('Mean Inhibition Zone (mm)')
     axes[1, 1].grid(True, alpha=0.3, axis='x')
     
-    plt.tight_layout()
-    plt.savefig('overview_plots.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    save_figure(fig, 'overview_plots.png')
 
-def create_heatmap(df):
+def create_heatmap(heatmap_data):
     """Create heatmap of plant extracts vs bacteria"""
-    # Calculate mean inhibition zones
-    heatmap_data = df.groupby(['Plant_Extract', 'Bacteria'])['Inhibition_Zone_mm'].mean().unstack()
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    plt.figure(figsize=(12, 8))
+    fig = plt.figure(figsize=(12, 8), constrained_layout=True)
+    # Simplify plant names for better readability
     sns.heatmap(heatmap_data, annot=True, fmt='.1f', cmap='RdYlGn', 
-                cbar_kws={'label': 'Mean Inhibition Zone (mm)'})
+                cbar_kws={'label': 'Mean Inhibition Zone (mm)'},
+                yticklabels=[SHORT_NAMES[name] for name in heatmap_data.index])
     plt.title('Antibacterial Activity Heatmap\n(Plant Extracts vs Bacteria)', fontsize=14, fontweight='bold')
     plt.xlabel('Bacteria Species')
     plt.ylabel('Plant Extracts')
     plt.xticks(rotation=45, ha='right')
     plt.yticks(rotation=0)
     
-    # Simplify plant names for better readability
-    y_labels = [label.get_text().split('(')[0].strip() for label in plt.gca().get_yticklabels()]
-    plt.gca().set_yticklabels(y_labels)
+    save_figure(fig, 'activity_heatmap.png')
+
+def draw_quantile_boxplot(ax, df, group_col, order, labels=None):
+    """Draw box plots from precomputed quantiles (whiskers span min to max)"""
+    import seaborn as sns
+    
+    quantiles = df.groupby(group_col, observed=True)['Inhibition_Zone_mm'].quantile([0, 0.25, 0.5, 0.75, 1]).unstack()
+    quantiles = quantiles.loc[order]
     
-    plt.tight_layout()
-    plt.savefig('activity_heatmap.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    box_stats = [
+        {'label': label, 'whislo': q[0], 'q1': q[1], 'med': q[2], 'q3': q[3], 'whishi': q[4]}
+        for label, q in zip(labels or quantiles.index, quantiles.to_numpy())
+    ]
+    ax.bxp(box_stats, showfliers=False, patch_artist=True,
+           boxprops={'facecolor': sns.color_palette()[0], 'alpha': 0.7},
+           medianprops={'color': 'black'})
 
-def create_boxplots(df):
+def create_boxplots(df, plant_stats, bact_stats):
     """Create box plots for detailed analysis"""
-    fig, axes = plt.subplots(2, 1, figsize=(15, 12))
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 1, figsize=(15, 12), constrained_layout=True)
     
     # Box plot by plant extract
-    plant_order = df.groupby('Plant_Extract')['Inhibition_Zone_mm'].mean().sort_values(ascending=False).index
-    sns.boxplot(data=df, x='Plant_Extract', y='Inhibition_Zone_mm', order=plant_order, ax=axes[0])
+    plant_order = plant_stats['mean'].sort_values(ascending=False).index
+    draw_quantile_boxplot(axes[0], df, 'Plant_Extract', plant_order,
+                          labels=[SHORT_NAMES[name] for name in plant_order])
     axes[0].set_title('Inhibition Zone Distribution by Plant Extract', fontsize=14, fontweight='bold')
     axes[0].set_xlabel('Plant Extract')
     axes[0].set_ylabel('Inhibition Zone (mm)')
     axes[0].tick_params(axis='x', rotation=45)
     
-    # Simplify x-axis labels
-    x_labels = [label.get_text().split('(')[0].strip() for label in axes[0].get_xticklabels()]
-    axes[0].set_xticklabels(x_labels)
-    
     # Box plot by bacteria
-    bacteria_order = df.groupby('Bacteria')['Inhibition_Zone_mm'].mean().sort_values(ascending=False).index
-    sns.boxplot(data=df, x='Bacteria', y='Inhibition_Zone_mm', order=bacteria_order, ax=axes[1])
+    bacteria_order = bact_stats.sort_values(ascending=False).index
+    draw_quantile_boxplot(axes[1], df, 'Bacteria', bacteria_order)
     axes[1].set_title('Inhibition Zone Distribution by Bacteria', fontsize=14, fontweight='bold')
     axes[1].set_xlabel('Bacteria Species')
     axes[1].set_ylabel('Inhibition Zone (mm)')
     axes[1].tick_params(axis='x', rotation=45)
     
-    plt.tight_layout()
-    plt.savefig('distribution_boxplots.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    save_figure(fig, 'distribution_boxplots.png')
 
-def create_concentration_analysis(df):
+def create_concentration_analysis(df, plant_stats):
     """Create concentration effect analysis"""
-    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6), constrained_layout=True)
     
     # Line plot showing concentration effect for top 5 plants
-    top_plants = df.groupby('Plant_Extract')['Inhibition_Zone_mm'].mean().nlargest(5).index
+    top_plants = plant_stats['mean'].nlargest(5).index
+    
+    top_data = df[df['Plant_Extract'].isin(top_plants)]
+    conc_means = top_data.groupby(['Concentration_mg_mL', 'Plant_Extract'], observed=True)['Inhibition_Zone_mm'].mean().unstack()
     
     for plant in top_plants:
-        plant_data = df[df['Plant_Extract'] == plant]
-        conc_means = plant_data.groupby('Concentration_mg_mL')['Inhibition_Zone_mm'].mean()
-        axes[0].plot(conc_means.index, conc_means.values, marker='o', linewidth=2, 
-                    label=plant.split('(')[0].strip())
+        axes[0].plot(conc_means.index, conc_means[plant].values, marker='o', linewidth=2, 
+                    label=SHORT_NAMES[plant])
     
     axes[0].set_title('Concentration Effect - Top 5 Plant Extracts', fontsize=12, fontweight='bold')
     axes[0].set_xlabel('Concentration (mg/mL)')
@@ -138,41 +137,29 @@ def create_concentration_analysis(df):
     axes[1].set_xlabel('Concentration (mg/mL)')
     axes[1].set_ylabel('Inhibition Zone (mm)')
     
-    plt.tight_layout()
-    plt.savefig('concentration_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    save_figure(fig, 'concentration_analysis.png')
 
-def create_effectiveness_chart(df):
+def create_effectiveness_chart(plant_stats):
     """Create effectiveness ranking chart"""
-    # Calculate effectiveness metrics
-    plant_stats = df.groupby('Plant_Extract').agg({
-        'Inhibition_Zone_mm': ['mean', 'std', 'count']
-    }).round(2)
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Rectangle
     
-    plant_stats.columns = ['mean', 'std', 'count']
-    plant_stats['se'] = plant_stats['std'] / np.sqrt(plant_stats['count'])
+    # Calculate effectiveness metrics
     plant_stats = plant_stats.sort_values('mean', ascending=True)
+    means = plant_stats['mean'].to_numpy()
+    se = plant_stats['std'].to_numpy() / np.sqrt(plant_stats['count'].to_numpy())
     
     # Create horizontal bar chart with error bars
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
-    y_pos = np.arange(len(plant_stats))
-    bars = ax.barh(y_pos, plant_stats['mean'], xerr=plant_stats['se'], 
-                   capsize=5, alpha=0.7, color='lightcoral')
+    fig, ax = plt.subplots(figsize=(12, 8), constrained_layout=True)
     
     # Color bars based on effectiveness
-    for i, (bar, mean_val) in enumerate(zip(bars, plant_stats['mean'])):
-        if mean_val >= 18:
-            bar.set_color('darkgreen')
-        elif mean_val >= 15:
-            bar.set_color('green')
-        elif mean_val >= 12:
-            bar.set_color('orange')
-        else:
-            bar.set_color('red')
+    colors = np.select([means >= 18, means >= 15, means >= 12], ['darkgreen', 'green', 'orange'], default='red')
+    
+    y_pos = np.arange(len(plant_stats))
+    ax.barh(y_pos, means, xerr=se, capsize=5, alpha=0.7, color=colors)
     
     ax.set_yticks(y_pos)
-    ax.set_yticklabels([name.split('(')[0].strip() for name in plant_stats.index])
+    ax.set_yticklabels([SHORT_NAMES[name] for name in plant_stats.index])
     ax.set_xlabel('Mean Inhibition Zone (mm)')
     ax.set_title('Plant Extract Effectiveness Ranking\n(with Standard Error)', fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3, axis='x')
@@ -186,31 +173,36 @@ def create_effectiveness_chart(df):
     ]
     ax.legend(handles=legend_elements, loc='lower right')
     
-    plt.tight_layout()
-    plt.savefig('effectiveness_ranking.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    save_figure(fig, 'effectiveness_ranking.png')
 
-def main():
-    """Main visualization function"""
-    df = load_data()
+def main(df=None):
+    """Main visualization function (reads the CSV unless a DataFrame is passed)"""
+    df = load_data(df=df)
     if df is None:
         return
     
+    # Shared aggregates, computed once and reused by every plot
+    plant_stats = df.groupby('Plant_Extract')['Inhibition_Zone_mm'].agg(['mean', 'std', 'count'])
+    bact_stats = df.groupby('Bacteria')['Inhibition_Zone_mm'].mean()
+    conc_stats = df.groupby('Concentration_mg_mL')['Inhibition_Zone_mm'].agg(['mean', 'std'])
+    pb_heatmap = df.groupby(['Plant_Extract', 'Bacteria'])['Inhibition_Zone_mm'].mean().unstack()
+    
+    set_plot_style()
     print("Creating visualizations...")
     print("1. Overview plots...")
-    create_overview_plots(df)
+    create_overview_plots(df, plant_stats, conc_stats)
     
     print("2. Activity heatmap...")
-    create_heatmap(df)
+    create_heatmap(pb_heatmap)
     
     print("3. Distribution box plots...")
-    create_boxplots(df)
+    create_boxplots(df, plant_stats, bact_stats)
     
     print("4. Concentration analysis...")
-    create_concentration_analysis(df)
+    create_concentration_analysis(df, plant_stats)
     
     print("5. Effectiveness ranking...")
-    create_effectiveness_chart(df)
+    create_effectiveness_chart(plant_stats)
     
     print("\nAll visualizations created and saved!")
     print("Files saved:")
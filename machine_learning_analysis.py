@@ -1,40 +1,35 @@
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-import matplotlib.pyplot as plt
-import seaborn as sns
+from common import SHORT_NAMES, load_data, save_figure
 import warnings
 warnings.filterwarnings('ignore')
 
-def load_and_prepare_data():
-    """Load and prepare data for machine learning"""
-    try:
-        df = pd.read_csv('antibacterial_data.csv')
-    except FileNotFoundError:
-        print("Data file not found. Please run data_generator.py first.")
-        return None, None
+def load_and_prepare_data(df=None):
+    """Load (or take) and prepare data for machine learning"""
+    df = load_data(df=df)
+    if df is None:
+        return None, None, None, None
     
     # Prepare features
-    # Encode categorical variables
-    le_plant = LabelEncoder()
-    le_bacteria = LabelEncoder()
-    
-    df['Plant_Encoded'] = le_plant.fit_transform(df['Plant_Extract'])
-    df['Bacteria_Encoded'] = le_bacteria.fit_transform(df['Bacteria'])
+    # Encode categorical variables via their category codes
+    df['Plant_Encoded'] = df['Plant_Extract'].cat.codes.to_numpy()
+    df['Bacteria_Encoded'] = df['Bacteria'].cat.codes.to_numpy()
     
     # Features for prediction
     features = ['Plant_Encoded', 'Bacteria_Encoded', 'Concentration_mg_mL']
     X = df[features]
     y = df['Inhibition_Zone_mm']
     
-    # Store encoders for later use
+    # Store category lookups for later encoding
     encoders = {
-        'plant': le_plant,
-        'bacteria': le_bacteria
+        'plant': df['Plant_Extract'].cat.categories,
+        'bacteria': df['Bacteria'].cat.categories
     }
     
     return X, y, df, encoders
@@ -44,16 +39,13 @@ def train_models(X, y):
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Initialize models
+    # Initialize models (only the linear model needs scaled features)
     models = {
-        'Linear Regression': LinearRegression(),
-        'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42),
-        'Gradient Boosting': GradientBoostingRegressor(n_estimators=100, random_state=42)
+        'Linear Regression': Pipeline([('scaler', StandardScaler()), ('lr', LinearRegression())]),
+        'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1),
+        # Plant and bacteria codes are nominal, so let the booster treat them as categorical
+        'Gradient Boosting': HistGradientBoostingRegressor(max_iter=100, categorical_features=[True, True, False],
+                                                           random_state=42)
     }
     
     results = {}
@@ -63,15 +55,8 @@ def train_models(X, y):
     for name, model in models.items():
         print(f"Training {name}...")
         
-        # Use scaled data for Linear Regression, original for tree-based models
-        if name == 'Linear Regression':
-            model.fit(X_train_scaled, y_train)
-            y_pred = model.predict(X_test_scaled)
-            X_cv = X_train_scaled
-        else:
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-            X_cv = X_train
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
         
         # Calculate metrics
         mse = mean_squared_error(y_test, y_pred)
@@ -80,7 +65,7 @@ def train_models(X, y):
         r2 = r2_score(y_test, y_pred)
         
         # Cross-validation
-        cv_scores = cross_val_score(model, X_cv, y_train, cv=5, scoring='r2')
+        cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='r2', n_jobs=-1)
         
         results[name] = {
             'model': model,
@@ -100,10 +85,12 @@ def train_models(X, y):
         print(f"  CV R² (mean ± std): {cv_scores.mean():.3f} ± {cv_scores.std():.3f}")
         print()
     
-    return results, scaler
+    return results
 
 def feature_importance_analysis(results):
     """Analyze feature importance"""
+    import matplotlib.pyplot as plt
+    
     print("=== FEATURE IMPORTANCE ANALYSIS ===\n")
     
     # Get Random Forest feature importance
@@ -116,7 +103,7 @@ def feature_importance_analysis(results):
         print(f"  {name}: {imp:.3f}")
     
     # Visualize feature importance
-    plt.figure(figsize=(10, 6))
+    fig = plt.figure(figsize=(10, 6), constrained_layout=True)
     bars = plt.bar(feature_names, importance, color=['lightcoral', 'lightblue', 'lightgreen'])
     plt.title('Feature Importance (Random Forest)', fontsize=14, fontweight='bold')
     plt.ylabel('Importance')
@@ -127,13 +114,13 @@ def feature_importance_analysis(results):
         plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.01,
                 f'{imp:.3f}', ha='center', va='bottom')
     
-    plt.tight_layout()
-    plt.savefig('feature_importance.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    save_figure(fig, 'feature_importance.png')
 
 def model_comparison_plot(results):
     """Create model comparison visualization"""
-    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6), constrained_layout=True)
     
     # Performance metrics comparison
     models = list(results.keys())
@@ -175,9 +162,15 @@ def model_comparison_plot(results):
     axes[1].text(0.05, 0.95, f'R² = {r2:.3f}', transform=axes[1].transAxes, 
                 bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
     
-    plt.tight_layout()
-    plt.savefig('model_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    save_figure(fig, 'model_comparison.png')
+
+def encode_labels(categories, labels):
+    """Category codes of labels, raising ValueError for labels not seen in training"""
+    codes = categories.get_indexer(labels)
+    if (codes == -1).any():
+        unknown = [label for label, code in zip(labels, codes) if code == -1]
+        raise ValueError(f"Labels not seen in training: {unknown}")
+    return codes
 
 def predict_new_combinations(results, encoders, df):
     """Predict antibacterial activity for new combinations"""
@@ -206,39 +199,38 @@ def predict_new_combinations(results, encoders, df):
     print("Predicted Inhibition Zones for New Combinations:")
     print("-" * 60)
     
-    for plant, bacteria, concentration in test_combinations:
-        # Encode the inputs
-        plant_encoded = encoders['plant'].transform([plant])[0]
-        bacteria_encoded = encoders['bacteria'].transform([bacteria])[0]
-        
-        # Make prediction
-        X_new = np.array([[plant_encoded, bacteria_encoded, concentration]])
-        prediction = best_model.predict(X_new)[0]
-        
-        # Determine activity level
-        if prediction >= 20:
-            activity = 'High'
-        elif prediction >= 15:
-            activity = 'Moderate'
-        elif prediction >= 10:
-            activity = 'Low'
-        else:
-            activity = 'None'
-        
-        print(f"Plant: {plant.split('(')[0].strip()}")
+    # Encode all combinations and predict in a single call
+    plants_enc = encode_labels(encoders['plant'], [c[0] for c in test_combinations])
+    bact_enc = encode_labels(encoders['bacteria'], [c[1] for c in test_combinations])
+    concs = np.array([c[2] for c in test_combinations])
+    
+    # Named like the training features, so sklearn rejects a column mix-up
+    X_new = pd.DataFrame({
+        'Plant_Encoded': plants_enc,
+        'Bacteria_Encoded': bact_enc,
+        'Concentration_mg_mL': concs
+    })
+    predictions = best_model.predict(X_new)
+    
+    # Determine activity levels
+    activity_labels = np.array(['None', 'Low', 'Moderate', 'High'])
+    activities = activity_labels[np.searchsorted(np.array([10, 15, 20]), predictions, side='right')]
+    
+    for (plant, bacteria, concentration), prediction, activity in zip(test_combinations, predictions, activities):
+        print(f"Plant: {SHORT_NAMES[plant]}")
         print(f"Bacteria: {bacteria}")
         print(f"Concentration: {concentration} mg/mL")
         print(f"Predicted Inhibition Zone: {prediction:.2f} mm")
         print(f"Predicted Activity Level: {activity}")
         print("-" * 60)
 
-def main():
-    """Main machine learning analysis function"""
+def main(df=None):
+    """Main machine learning analysis function (reads the CSV unless a DataFrame is passed)"""
     print("MACHINE LEARNING ANALYSIS")
     print("=" * 50)
     
     # Load and prepare data
-    X, y, df, encoders = load_and_prepare_data()
+    X, y, df, encoders = load_and_prepare_data(df)
     if X is None:
         return
     
@@ -247,7 +239,7 @@ def main():
     print()
     
     # Train models
-    results, scaler = train_models(X, y)
+    results = train_models(X, y)
     
     # Feature importance analysis
     feature_importance_analysis(results)
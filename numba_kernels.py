@@ -0,0 +1,28 @@
+import math
+import numpy as np
+from numba import njit, prange
+
+# Compiled kernels for large datasets. Importing Numba and loading a kernel
+# costs more than the NumPy/SciPy versions save at the default dataset
+# size, so callers import this module lazily above a row-count threshold.
+
+@njit(cache=True, fastmath=True)
+def group_moments(codes, vals, k):
+    """Per-group count, sum and sum of squares in a single pass"""
+    n = np.zeros(k)
+    total = np.zeros(k)
+    total_sq = np.zeros(k)
+    for i in range(codes.shape[0]):
+        c = codes[i]
+        n[c] += 1.0
+        total[c] += vals[i]
+        total_sq[c] += vals[i] * vals[i]
+    return n, total, total_sq
+
+@njit(parallel=True, fastmath=True, cache=True)
+def compute_iz(plant_idx, bact_idx, conc, base, var, res, noise, out):
+    """Compute inhibition zones (mm) into out with a compiled parallel loop"""
+    for i in prange(out.shape[0]):
+        iz = (base[plant_idx[i]] + math.log10(conc[i] / 10) * 3) * res[bact_idx[i]] + noise[i] * var[plant_idx[i]]
+        out[i] = max(0.0, iz)
+    return out
@@ -1,88 +1,217 @@
+import contextlib
+import importlib
+import io
+import multiprocessing
+import selectors
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import sys
 import os
+import traceback
+
+def run_scripts(steps):
+    """Run (script_name, description) steps as concurrent child processes, streaming their output"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    # Unbuffered UTF-8 children, so their output streams line by line rather than at exit
+    env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+    results = {}
+    procs = {}
+    
+    for script_name, description in steps:
+        print(f"\n{'='*60}")
+        print(f"RUNNING: {description}")
+        print('='*60)
+        try:
+            # Raw binary pipes: select() watches the OS pipe, so reads must not buffer ahead of it
+            procs[description] = subprocess.Popen([sys.executable, script_name],
+                                                  stdout=subprocess.PIPE,
+                                                  stderr=subprocess.STDOUT,
+                                                  bufsize=0,
+                                                  cwd=script_dir,
+                                                  env=env)
+        except Exception as e:
+            print(f"❌ Error running {description}: {str(e)}")
+            results[description] = False
+    
+    # Label lines with their step only when several children share the console
+    label = len(procs) > 1
+    
+    def emit(description, lines):
+        """Print complete lines of child output, labelled with their step if needed"""
+        text = b''.join(lines).decode('utf-8', errors='replace').replace('\r\n', '\n')
+        if label:
+            text = ''.join(f"[{description}] {line}" for line in text.splitlines(keepends=True))
+        print(text, end='')
+    
+    if os.name == 'nt':
+        # Windows can't select() on pipes; drain the children one at a time
+        for description, proc in procs.items():
+            for line in proc.stdout:
+                emit(description, [line])
+    else:
+        # Per-child bytes after the last newline, held until the line is complete
+        partial = {description: b'' for description in procs}
+        with selectors.DefaultSelector() as selector:
+            for description, proc in procs.items():
+                selector.register(proc.stdout, selectors.EVENT_READ, description)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    description = key.data
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        if partial[description]:
+                            emit(description, [partial[description], b'\n'])
+                        continue
+                    *lines, partial[description] = (partial[description] + chunk).split(b'\n')
+                    if lines:
+                        emit(description, [line + b'\n' for line in lines])
+    
+    for description, proc in procs.items():
+        proc.stdout.close()
+        returncode = proc.wait()
+        if returncode == 0:
+            print(f"✅ {description} completed successfully!")
+        else:
+            print(f"❌ {description} failed with return code {returncode}")
+        results[description] = returncode == 0
+    
+    return results
 
 def run_script(script_name, description):
     """Run a Python script and handle errors"""
+    return run_scripts([(script_name, description)])[description]
+
+def run_stage(module_name, description, *args):
+    """Run a pipeline stage's main() in this process; returns (success, result)"""
     print(f"\n{'='*60}")
     print(f"RUNNING: {description}")
     print('='*60)
     
     try:
-        result = subprocess.run([sys.executable, script_name], 
-                              capture_output=False, 
-                              text=True, 
-                              cwd=os.path.dirname(os.path.abspath(__file__)))
-        
-        if result.returncode == 0:
-            print(f"✅ {description} completed successfully!")
-        else:
-            print(f"❌ {description} failed with return code {result.returncode}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error running {description}: {str(e)}")
-        return False
-    
-    return True
+        result = importlib.import_module(module_name).main(*args)
+        print(f"✅ {description} completed successfully!")
+    except Exception:
+        # Full traceback on stdout, so workers capture (and label) it with their output
+        print(f"❌ Error running {description}:\n{traceback.format_exc()}", end='')
+        return False, None
+    
+    return True, result
+
+def run_stage_captured(module_name, description, *args):
+    """Run a pipeline stage in a worker process; returns (success, captured output)"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        success, _ = run_stage(module_name, description, *args)
+    return success, output.getvalue()
+
+def warn_if_failed(description, success):
+    """Print a warning as soon as a pipeline step fails"""
+    if not success:
+        print(f"\n⚠️  Warning: {description} failed. Continuing with remaining steps...")
+
+def run_step(module_name, description, isolated, *args):
+    """Run a pipeline step in-process, or as its own script if isolated"""
+    if isolated:
+        return run_script(f"{module_name}.py", description), None
+    return run_stage(module_name, description, *args)
 
 def main():
     """Run complete antibacterial activity analysis pipeline"""
-    print("ANTIBACTERIAL ACTIVITY ANALYSIS - COMPLETE PIPELINE")
-    print("="*60)
-    print("This script will run the complete analysis pipeline:")
-    print("1. Generate synthetic data")
-    print("2. Perform statistical analysis") 
-    print("3. Create visualizations")
-    print("4. Run machine learning analysis")
-    print("5. Generate comprehensive report")
-    print()
+    # Stages run in-process by default so imports and the parsed CSV are
+    # shared; --isolated runs each script in its own interpreter instead
+    isolated = '--isolated' in sys.argv[1:]
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    
+    print('\n'.join([
+        "ANTIBACTERIAL ACTIVITY ANALYSIS - COMPLETE PIPELINE",
+        "="*60,
+        "This script will run the complete analysis pipeline:",
+        "1. Generate synthetic data",
+        "2. Perform statistical analysis",
+        "3. Create visualizations",
+        "4. Run machine learning analysis",
+        "5. Generate comprehensive report",
+        ""
+    ]))
     
     # List of scripts to run in order
     analysis_steps = [
-        ("data_generator.py", "Data Generation"),
-        ("statistical_analysis.py", "Statistical Analysis"),
-        ("data_visualization.py", "Data Visualization"),
-        ("machine_learning_analysis.py", "Machine Learning Analysis"),
-        ("report_generator.py", "Report Generation")
+        ("data_generator", "Data Generation"),
+        ("statistical_analysis", "Statistical Analysis"),
+        ("data_visualization", "Data Visualization"),
+        ("machine_learning_analysis", "Machine Learning Analysis"),
+        ("report_generator", "Report Generation")
     ]
     
-    # Track success of each step
-    results = {}
+    # Track success of each step (in pipeline order)
+    results = {description: False for _, description in analysis_steps}
     
-    # Run each analysis step
-    for script, description in analysis_steps:
-        success = run_script(script, description)
-        results[description] = success
-        
-        if not success:
-            print(f"\n⚠️  Warning: {description} failed. Continuing with remaining steps...")
+    # Data generation runs first; statistics, visualization and machine learning
+    # only read its output, so they run in parallel before the final report
+    generation_step, *independent_steps, report_step = analysis_steps
     
-    # Final summary
-    print(f"\n{'='*60}")
-    print("ANALYSIS PIPELINE SUMMARY")
-    print('='*60)
+    # In-process stages reuse the generated DataFrame instead of re-reading the CSV
+    results[generation_step[1]], df = run_step(*generation_step, isolated)
+    warn_if_failed(generation_step[1], results[generation_step[1]])
+    
+    if isolated:
+        # Child interpreters run side by side with their output multiplexed here
+        step_results = run_scripts([(f"{module_name}.py", description)
+                                    for module_name, description in independent_steps])
+        for description, success in step_results.items():
+            results[description] = success
+            warn_if_failed(description, success)
+    else:
+        # Spawn (not fork) workers: data generation has already started PyArrow's thread pool,
+        # which isn't fork-safe, and spawn matches the Windows and macOS default.
+        # Each worker's output is captured and printed as one labelled block once it finishes
+        with ProcessPoolExecutor(max_workers=len(independent_steps),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {executor.submit(run_stage_captured, module_name, description, df): description
+                       for module_name, description in independent_steps}
+            for future in as_completed(futures):
+                description = futures[future]
+                try:
+                    results[description], output = future.result()
+                except Exception as e:
+                    # The worker died or its result couldn't be sent back
+                    results[description], output = False, f"❌ Error running {description}: {e!r}\n"
+                print(''.join(f"[{description}] {line}" for line in output.splitlines(keepends=True)), end='')
+                warn_if_failed(description, results[description])
+    
+    results[report_step[1]], _ = run_step(*report_step, isolated, df)
+    warn_if_failed(report_step[1], results[report_step[1]])
+    
+    # Final summary, built up and written with a single print
+    lines = [f"\n{'='*60}", "ANALYSIS PIPELINE SUMMARY", '='*60]
     
     for step, success in results.items():
         status = "✅ SUCCESS" if success else "❌ FAILED"
-        print(f"{step:<30} {status}")
+        lines.append(f"{step:<30} {status}")
     
     successful_steps = sum(results.values())
     total_steps = len(results)
     
-    print(f"\nOverall Success Rate: {successful_steps}/{total_steps} ({(successful_steps/total_steps)*100:.1f}%)")
+    lines.append(f"\nOverall Success Rate: {successful_steps}/{total_steps} ({(successful_steps/total_steps)*100:.1f}%)")
     
     if successful_steps == total_steps:
-        print("\n🎉 Complete analysis pipeline executed successfully!")
-        print("\nGenerated files:")
-        print("📊 Data: antibacterial_data.csv")
-        print("📈 Visualizations: *.png files")
-        print("📋 HTML Report: antibacterial_analysis_report.html")
-        print("📄 Summary: analysis_summary.txt")
-        print("\n💡 Open the HTML report in your browser for the complete analysis!")
+        lines += [
+            "\n🎉 Complete analysis pipeline executed successfully!",
+            "\nGenerated files:",
+            "📊 Data: antibacterial_data.csv (+ antibacterial_data.feather)",
+            "📈 Visualizations: *.png files",
+            "📋 HTML Report: antibacterial_analysis_report.html",
+            "📄 Summary: analysis_summary.txt",
+            "\n💡 Open the HTML report in your browser for the complete analysis!"
+        ]
     else:
-        print(f"\n⚠️  Pipeline completed with {total_steps - successful_steps} failed step(s).")
-        print("Check the error messages above for troubleshooting.")
+        lines += [
+            f"\n⚠️  Pipeline completed with {total_steps - successful_steps} failed step(s).",
+            "Check the error messages above for troubleshooting."
+        ]
+    
+    print('\n'.join(lines))
 
 if __name__ == "__main__":
     main()
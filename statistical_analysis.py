@@ -2,41 +2,37 @@ import pandas as pd
 import numpy as np
 from scipy import stats
 from scipy.stats import f_oneway, tukey_hsd
+from common import load_data
 import warnings
 warnings.filterwarnings('ignore')
 
-def load_data():
-    """Load the antibacterial data"""
-    try:
-        df = pd.read_csv('antibacterial_data.csv')
-        return df
-    except FileNotFoundError:
-        print("Data file not found. Please run data_generator.py first.")
-        return None
+# Below this many rows scipy's f_oneway is faster than importing Numba and
+# loading the compiled ANOVA kernel
+NUMBA_MIN_ROWS = 1_000_000
 
 def descriptive_statistics(df):
     """Calculate descriptive statistics"""
     print("=== DESCRIPTIVE STATISTICS ===\n")
     
-    # Overall statistics
+    # Overall statistics (zones are float32; print them at measurement precision)
     print("Overall Inhibition Zone Statistics:")
-    print(df['Inhibition_Zone_mm'].describe())
+    print(df['Inhibition_Zone_mm'].describe().to_string(float_format='{:.2f}'.format))
     print()
     
     # Statistics by plant extract
     print("Statistics by Plant Extract:")
-    plant_stats = df.groupby('Plant_Extract')['Inhibition_Zone_mm'].agg([
+    plant_stats = df.groupby('Plant_Extract', observed=True)['Inhibition_Zone_mm'].agg([
         'count', 'mean', 'std', 'min', 'max'
-    ]).round(2)
-    print(plant_stats)
+    ])
+    print(plant_stats.to_string(float_format='{:.2f}'.format))
     print()
     
     # Statistics by bacteria
     print("Statistics by Bacteria:")
-    bacteria_stats = df.groupby('Bacteria')['Inhibition_Zone_mm'].agg([
+    bacteria_stats = df.groupby('Bacteria', observed=True)['Inhibition_Zone_mm'].agg([
         'count', 'mean', 'std', 'min', 'max'
-    ]).round(2)
-    print(bacteria_stats)
+    ])
+    print(bacteria_stats.to_string(float_format='{:.2f}'.format))
     print()
     
     # Activity level distribution
@@ -49,14 +45,58 @@ def descriptive_statistics(df):
     
     return plant_stats, bacteria_stats
 
+def _oneway_f(group_moments, codes, vals, k):
+    """One-way ANOVA F statistic and p-value from integer group codes"""
+    n, total, total_sq = group_moments(codes, vals, k)
+    observed = n > 0
+    n, total, total_sq = n[observed], total[observed], total_sq[observed]
+    
+    n_total = n.sum()
+    between = (total ** 2 / n).sum()
+    ss_between = between - total.sum() ** 2 / n_total
+    ss_within = total_sq.sum() - between
+    df_between, df_within = len(n) - 1, n_total - len(n)
+    
+    f_stat = (ss_between / df_between) / (ss_within / df_within)
+    return f_stat, stats.f.sf(f_stat, df_between, df_within)
+
+def group_codes(df, key):
+    """Integer group codes of key and the number of groups"""
+    if isinstance(df[key].dtype, pd.CategoricalDtype):
+        return df[key].cat.codes.to_numpy(), len(df[key].cat.categories)
+    codes, uniques = pd.factorize(df[key])
+    return codes, len(uniques)
+
+def split_views(df, key):
+    """Inhibition zones split into one contiguous array per group of key"""
+    codes, _ = group_codes(df, key)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    # float64 so scipy doesn't compute (and underflow) the p-values in float32
+    vals = df['Inhibition_Zone_mm'].to_numpy(np.float64)[order]
+    # Views into the single sorted buffer, so no per-group copies
+    return np.split(vals, np.flatnonzero(np.diff(sorted_codes)) + 1)
+
+def oneway_anova(df, key):
+    """One-way ANOVA of inhibition zone across the groups of key"""
+    if len(df) >= NUMBA_MIN_ROWS:
+        try:
+            from numba_kernels import group_moments
+        except ImportError:  # Numba is optional; fall back to scipy's f_oneway
+            pass
+        else:
+            codes, k = group_codes(df, key)
+            return _oneway_f(group_moments, codes, df['Inhibition_Zone_mm'].to_numpy(np.float64), k)
+    
+    return f_oneway(*split_views(df, key))
+
 def anova_analysis(df):
     """Perform ANOVA analysis"""
     print("\n=== ANOVA ANALYSIS ===\n")
     
     # ANOVA for plant extracts
     print("1. One-way ANOVA: Plant Extracts vs Inhibition Zone")
-    plant_groups = [group['Inhibition_Zone_mm'].values for name, group in df.groupby('Plant_Extract')]
-    f_stat_plants, p_val_plants = f_oneway(*plant_groups)
+    f_stat_plants, p_val_plants = oneway_anova(df, 'Plant_Extract')
     
     print(f"F-statistic: {f_stat_plants:.4f}")
     print(f"P-value: {p_val_plants:.4e}")
@@ -68,8 +108,7 @@ def anova_analysis(df):
     
     # ANOVA for bacteria
     print("\n2. One-way ANOVA: Bacteria vs Inhibition Zone")
-    bacteria_groups = [group['Inhibition_Zone_mm'].values for name, group in df.groupby('Bacteria')]
-    f_stat_bacteria, p_val_bacteria = f_oneway(*bacteria_groups)
+    f_stat_bacteria, p_val_bacteria = oneway_anova(df, 'Bacteria')
     
     print(f"F-statistic: {f_stat_bacteria:.4f}")
     print(f"P-value: {p_val_bacteria:.4e}")
@@ -81,8 +120,7 @@ def anova_analysis(df):
     
     # ANOVA for concentration
     print("\n3. One-way ANOVA: Concentration vs Inhibition Zone")
-    conc_groups = [group['Inhibition_Zone_mm'].values for name, group in df.groupby('Concentration_mg_mL')]
-    f_stat_conc, p_val_conc = f_oneway(*conc_groups)
+    f_stat_conc, p_val_conc = oneway_anova(df, 'Concentration_mg_mL')
     
     print(f"F-statistic: {f_stat_conc:.4f}")
     print(f"P-value: {p_val_conc:.4e}")
@@ -92,16 +130,20 @@ def anova_analysis(df):
     else:
         print("Result: No significant difference between concentrations (p >= 0.05)")
 
+def pearson_and_p(df):
+    """Pearson correlation (and p-value) between concentration and inhibition zone"""
+    x = df['Concentration_mg_mL'].to_numpy(np.float64)
+    y = df['Inhibition_Zone_mm'].to_numpy(np.float64)
+    r, p = stats.pearsonr(x, y)
+    return r, p
+
 def correlation_analysis(df):
     """Analyze correlations"""
     print("\n=== CORRELATION ANALYSIS ===\n")
     
-    # Correlation between concentration and inhibition zone
-    correlation = df['Concentration_mg_mL'].corr(df['Inhibition_Zone_mm'])
-    print(f"Correlation between Concentration and Inhibition Zone: {correlation:.4f}")
-    
-    # Statistical significance test
-    r, p_value = stats.pearsonr(df['Concentration_mg_mL'], df['Inhibition_Zone_mm'])
+    # Correlation between concentration and inhibition zone, with significance test
+    r, p_value = pearson_and_p(df)
+    print(f"Correlation between Concentration and Inhibition Zone: {r:.4f}")
     print(f"Pearson correlation coefficient: {r:.4f}")
     print(f"P-value: {p_value:.4e}")
     
@@ -115,13 +157,15 @@ def effectiveness_ranking(df):
     print("\n=== EFFECTIVENESS RANKING ===\n")
     
     # Calculate mean inhibition zone for each plant
-    plant_effectiveness = df.groupby('Plant_Extract')['Inhibition_Zone_mm'].agg([
+    plant_effectiveness = df.groupby('Plant_Extract', observed=True, sort=False)['Inhibition_Zone_mm'].agg([
         'mean', 'std', 'count'
-    ]).round(2)
+    ])
     
-    # Calculate confidence intervals
-    plant_effectiveness['ci_lower'] = plant_effectiveness['mean'] - 1.96 * (plant_effectiveness['std'] / np.sqrt(plant_effectiveness['count']))
-    plant_effectiveness['ci_upper'] = plant_effectiveness['mean'] + 1.96 * (plant_effectiveness['std'] / np.sqrt(plant_effectiveness['count']))
+    # Calculate confidence intervals (half-width computed once on the raw arrays)
+    mean = plant_effectiveness['mean'].to_numpy()
+    half_width = 1.96 * plant_effectiveness['std'].to_numpy() / np.sqrt(plant_effectiveness['count'].to_numpy())
+    plant_effectiveness['ci_lower'] = mean - half_width
+    plant_effectiveness['ci_upper'] = mean + half_width
     
     # Sort by mean effectiveness
     plant_effectiveness = plant_effectiveness.sort_values('mean', ascending=False)
@@ -130,18 +174,22 @@ def effectiveness_ranking(df):
     print("(Mean ± 95% Confidence Interval)")
     print("-" * 60)
     
-    for i, (plant, stats) in enumerate(plant_effectiveness.iterrows(), 1):
-        print(f"{i:2d}. {plant}")
-        print(f"    Mean: {stats['mean']:.2f} mm")
-        print(f"    95% CI: [{stats['ci_lower']:.2f}, {stats['ci_upper']:.2f}]")
-        print(f"    Std Dev: {stats['std']:.2f}")
-        print()
+    for i, (plant, mean, std, ci_lower, ci_upper) in enumerate(zip(
+            plant_effectiveness.index,
+            plant_effectiveness['mean'].to_numpy(),
+            plant_effectiveness['std'].to_numpy(),
+            plant_effectiveness['ci_lower'].to_numpy(),
+            plant_effectiveness['ci_upper'].to_numpy()), 1):
+        print(f"{i:2d}. {plant}\n"
+              f"    Mean: {mean:.2f} mm\n"
+              f"    95% CI: [{ci_lower:.2f}, {ci_upper:.2f}]\n"
+              f"    Std Dev: {std:.2f}\n")
     
     return plant_effectiveness
 
-def main():
-    """Main analysis function"""
-    df = load_data()
+def main(df=None):
+    """Main analysis function (reads the CSV unless a DataFrame is passed)"""
+    df = load_data(df=df)
     if df is None:
         return
     